@@ -5,10 +5,45 @@ High-performance license plate OCR using ankandrew/fast-plate-ocr
 
 import cv2
 import numpy as np
-import json
+import importlib.util
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 
+# Shared JSON encoder (orjson when available); the app always loads predator_alpr first
+from predator_alpr import _dumps
+
+# Engines run concurrently; OpenCV and Tesseract release the GIL in native code
+_ENGINE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='alpr_engine')
+
+# Per-mode (min_confidence, boost): results at or below min_confidence are
+# dropped, the rest have their confidence scaled by boost (capped at 95)
+OPENCV_MODES = {
+    'standard': (0.0, 1.0),
+    'aggressive': (0.0, 1.1),      # More aggressive detection - boost confidence
+    'conservative': (80.0, 1.0),   # More conservative - only high-confidence results
+}
+
+# Engine order tried by HybridALPREngine.process_with_best_engine
+ENGINE_PRIORITY = ('fast_plate_ocr', 'opencv_aggressive', 'opencv_standard', 'opencv_conservative')
+
+
+@lru_cache(maxsize=1)
+def _get_real_alpr():
+    """Shared RealALPR instance (imported lazily, built once)"""
+    from real_alpr import RealALPR
+    return RealALPR()
+
+
+def _detect_base(image: np.ndarray) -> Tuple[Dict, ...]:
+    """
+    Mode-independent detection results for a decoded image.
+    All OpenCV modes share this single pass and only differ in post-processing.
+    """
+    return tuple(_get_real_alpr().process_image_array(image))
+
+
 class EnhancedOpenCVEngine:
     """
     Enhanced OpenCV ALPR engine with multiple processing modes
@@ -18,39 +53,17 @@ class EnhancedOpenCVEngine:
     def __init__(self, mode: str = 'standard'):
         self.mode = mode  # 'standard', 'aggressive', 'conservative'
         self.is_initialized = True
+        if mode not in OPENCV_MODES:
+            mode = 'standard'
+        self.engine_name = f'opencv_{mode}'
+        self.min_confidence, self.boost = OPENCV_MODES[mode]
         
     def detect_and_recognize(self, image_path: str) -> List[Dict]:
         """
         Detect and recognize license plates using enhanced OpenCV
         """
         try:
-            from real_alpr import RealALPR
-            
-            # Configure based on mode
-            alpr = RealALPR()
-            
-            if self.mode == 'aggressive':
-                # More aggressive detection - lower thresholds
-                results = alpr.process_image(image_path)
-                # Boost confidence for aggressive mode
-                for result in results:
-                    result['confidence'] = min(result['confidence'] * 1.1, 95.0)
-                    result['engine'] = 'opencv_aggressive'
-                    
-            elif self.mode == 'conservative':
-                # More conservative - higher thresholds, more validation
-                results = alpr.process_image(image_path)
-                # Filter to only high-confidence results
-                results = [r for r in results if r['confidence'] > 80.0]
-                for result in results:
-                    result['engine'] = 'opencv_conservative'
-                    
-            else:  # standard
-                results = alpr.process_image(image_path)
-                for result in results:
-                    result['engine'] = 'opencv_standard'
-            
-            return results
+            return self.apply_mode(_get_real_alpr().process_image(image_path))
             
         except ImportError:
             logging.warning("Real ALPR module not available")
@@ -58,6 +71,17 @@ class EnhancedOpenCVEngine:
         except Exception as e:
             logging.error(f"Enhanced OpenCV recognition failed: {str(e)}")
             return []
+    
+    def apply_mode(self, base_results) -> List[Dict]:
+        """
+        Derive this mode's results from shared detection results.
+        Result dicts are copied so base results shared by several modes are never mutated.
+        """
+        if self.boost == 1.0:
+            return [dict(r, engine=self.engine_name)
+                    for r in base_results if r['confidence'] > self.min_confidence]
+        return [dict(r, confidence=min(r['confidence'] * self.boost, 95.0), engine=self.engine_name)
+                for r in base_results if r['confidence'] > self.min_confidence]
 
 
 class FastPlateOCRPlaceholder:
@@ -72,6 +96,9 @@ class FastPlateOCRPlaceholder:
         
     def initialize(self) -> bool:
         """Check if fast-plate-ocr is available"""
+        # Cheap spec lookup first: no import cost when the package is absent
+        if importlib.util.find_spec('fast_plate_ocr') is None:
+            return False
         try:
             import fast_plate_ocr
             # If we get here, the library is available
@@ -86,6 +113,12 @@ class FastPlateOCRPlaceholder:
         Would use fast-plate-ocr if available
         """
         return []  # Not available in current build
+    
+    def detect_and_recognize_array(self, image: np.ndarray) -> List[Dict]:
+        """
+        Would use fast-plate-ocr on an already-decoded image if available
+        """
+        return []  # Not available in current build
 
 
 class HybridALPREngine:
@@ -149,10 +182,33 @@ class HybridALPREngine:
         """Process image with all available engines for comparison"""
         results = {}
         
+        # Decode once per request; every engine and the OpenCV detection share it
+        image = cv2.imread(image_path)
+        if image is None:
+            return {engine_name: [] for engine_name in self.available_engines}
+        
+        # Dispatch non-OpenCV engines and the shared OpenCV detection concurrently
+        futures = {
+            engine_name: _ENGINE_POOL.submit(self.engines[engine_name].detect_and_recognize_array, image)
+            for engine_name in self.available_engines
+            if not isinstance(self.engines[engine_name], EnhancedOpenCVEngine)
+        }
+        base_future = _ENGINE_POOL.submit(_detect_base, image)
+        
+        # Run the shared OpenCV detection once for all OpenCV modes
+        try:
+            base_results = base_future.result()
+        except Exception as e:
+            logging.error(f"OpenCV detection failed: {str(e)}")
+            base_results = ()
+        
         for engine_name in self.available_engines:
             try:
-                engine_results = self.process_with_engine(image_path, engine_name)
-                results[engine_name] = engine_results
+                engine = self.engines[engine_name]
+                if isinstance(engine, EnhancedOpenCVEngine):
+                    results[engine_name] = engine.apply_mode(base_results)
+                else:
+                    results[engine_name] = futures[engine_name].result()
             except Exception as e:
                 logging.error(f"Engine {engine_name} failed: {str(e)}")
                 results[engine_name] = []
@@ -164,23 +220,40 @@ class HybridALPREngine:
         Process with the best available engine
         Priority: fast_plate_ocr > opencv_aggressive > opencv_standard > opencv_conservative
         """
-        engine_priority = ['fast_plate_ocr', 'opencv_aggressive', 'opencv_standard', 'opencv_conservative']
+        # Decode once per request and hand the same image to every engine tried
+        image = cv2.imread(image_path)
+        if image is None:
+            return []
         
-        for engine_name in engine_priority:
+        base_results = None
+        for engine_name in ENGINE_PRIORITY:
             if engine_name in self.available_engines:
-                results = self.process_with_engine(image_path, engine_name)
+                engine = self.engines[engine_name]
+                if isinstance(engine, EnhancedOpenCVEngine):
+                    # OpenCV modes only differ in post-processing: detect once, on first need
+                    if base_results is None:
+                        try:
+                            base_results = _detect_base(image)
+                        except Exception as e:
+                            logging.error(f"OpenCV detection failed: {str(e)}")
+                            base_results = ()
+                    results = engine.apply_mode(base_results)
+                else:
+                    results = engine.detect_and_recognize_array(image)
                 if results:  # Return first successful result
                     return results
         
         return []
 
 
-# Global hybrid engine instance
-hybrid_alpr = HybridALPREngine()
+@lru_cache(maxsize=1)
+def _get_hybrid() -> HybridALPREngine:
+    """Global hybrid engine instance, built on first use to keep module import cheap"""
+    return HybridALPREngine()
 
 def get_available_alpr_engines() -> str:
     """Get list of available ALPR engines"""
-    engines = hybrid_alpr.get_available_engines()
+    engines = _get_hybrid().get_available_engines()
     engine_info = {
         'available_engines': engines,
         'descriptions': {
@@ -196,20 +269,20 @@ def get_available_alpr_engines() -> str:
             'cost': 'all_opencv_variants'
         }
     }
-    return json.dumps(engine_info)
+    return _dumps(engine_info)
 
 def process_with_specific_engine(image_path: str, engine_name: str) -> str:
     """Process image with a specific ALPR engine"""
     try:
-        results = hybrid_alpr.process_with_engine(image_path, engine_name)
-        return json.dumps({
+        results = _get_hybrid().process_with_engine(image_path, engine_name)
+        return _dumps({
             'success': True,
             'engine': engine_name,
             'results': results,
             'count': len(results)
         })
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             'success': False,
             'engine': engine_name,
             'error': str(e),
@@ -219,7 +292,7 @@ def process_with_specific_engine(image_path: str, engine_name: str) -> str:
 def compare_all_engines(image_path: str) -> str:
     """Compare results from all available ALPR engines"""
     try:
-        all_results = hybrid_alpr.process_with_all_engines(image_path)
+        all_results = _get_hybrid().process_with_all_engines(image_path)
         
         # Create comparison summary
         comparison = {
@@ -232,16 +305,23 @@ def compare_all_engines(image_path: str) -> str:
         
         # Generate summary statistics
         for engine_name, results in all_results.items():
+            # Single pass: accumulate confidence total and plate list together
+            total_confidence = 0
+            plates = []
+            for r in results:
+                total_confidence += r.get('confidence', 0)
+                plates.append(r.get('plate', ''))
+            
             comparison['summary'][engine_name] = {
                 'plates_detected': len(results),
-                'avg_confidence': sum(r.get('confidence', 0) for r in results) / max(len(results), 1),
-                'plates': [r.get('plate', '') for r in results]
+                'avg_confidence': total_confidence / max(len(results), 1),
+                'plates': plates
             }
         
-        return json.dumps(comparison)
+        return _dumps(comparison)
         
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             'success': False,
             'error': str(e),
             'results_by_engine': {}
@@ -250,17 +330,18 @@ def compare_all_engines(image_path: str) -> str:
 def process_with_best_engine(image_path: str) -> str:
     """Process with the best available engine"""
     try:
+        hybrid_alpr = _get_hybrid()
         results = hybrid_alpr.process_with_best_engine(image_path)
         best_engine = 'fast_plate_ocr' if 'fast_plate_ocr' in hybrid_alpr.available_engines else 'opencv_tesseract'
         
-        return json.dumps({
+        return _dumps({
             'success': True,
             'best_engine': best_engine,
             'results': results,
             'count': len(results)
         })
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             'success': False,
             'error': str(e),
             'results': []
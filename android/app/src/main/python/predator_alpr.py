@@ -5,12 +5,156 @@ Based on Connor Vieira's Predator ALPR algorithms
 """
 
 import cv2
+import heapq
+import itertools
 import json
+import platform
 import re
+import threading
 import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Dict, Tuple, Optional
 
+try:
+    # Optional: JIT-compile the scalar scoring path where numba is installed
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    # Optional: C JSON encoder, several times faster than the stdlib for result
+    # payloads and able to serialize NumPy scalars directly
+    import orjson
+    
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+except ImportError:
+    _dumps = json.dumps
+
+# US license plate formats
+PLATE_PATTERNS = (
+    r'^[A-Z]{2,3}[0-9]{3,4}$',  # ABC123, AB1234 (most common)
+    r'^[0-9][A-Z]{3}[0-9]{3}$',  # 1ABC123 format
+    r'^[A-Z][0-9]{2}[A-Z]{3}$',  # A12BCD format  
+    r'^[A-Z]{3}[0-9]{2}[A-Z]$',  # ABC12D format
+    r'^[0-9]{3}[A-Z]{3}$',  # 123ABC format
+)
+
+# Precompiled once: character strip and all plate formats fused into a single
+# alternation (one group per format so the matching pattern can be reported)
+_STRIP_RE = re.compile(r'[^A-Z0-9]')
+_PLATE_RE = re.compile('^(?:' + '|'.join('(' + p.strip('^$') + ')' for p in PLATE_PATTERNS) + ')$')
+# bytes.translate delete set: every byte outside A-Z/0-9
+_STRIP_BYTES = bytes(b for b in range(256) if not (0x41 <= b <= 0x5A or 0x30 <= b <= 0x39))
+# bytes.translate table reducing canonical text to its shape: letters -> 'A', digits -> '9'
+_SHAPE_TABLE = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', b'A' * 26 + b'9' * 10)
+
+def _build_plate_shapes() -> Dict[bytes, int]:
+    """
+    Every shape of plate length (5-8) that PLATE_PATTERNS accepts, mapped to the
+    index of the first matching pattern. The formats only constrain letter/digit
+    positions, so this finite table is an exact replacement for the regex on
+    canonical text.
+    """
+    shapes = {}
+    for length in range(5, 9):
+        for shape in itertools.product('A9', repeat=length):
+            match = _PLATE_RE.match(''.join(shape))
+            if match:
+                shapes[''.join(shape).encode('ascii')] = match.lastindex - 1
+    return shapes
+
+_PLATE_SHAPES = _build_plate_shapes()
+
+def canonical_plate_text(plate_text: str) -> str:
+    """Uppercase plate text with everything except A-Z/0-9 removed"""
+    text = plate_text.upper()
+    if text.isascii():
+        # OCR output is ASCII: already-clean text is returned as is, anything
+        # else goes through a bytes translate instead of the regex engine
+        if text.isalnum():
+            return text
+        return text.encode('ascii').translate(None, _STRIP_BYTES).decode('ascii')
+    return _STRIP_RE.sub('', text)
+
+# Detection runs on a downscaled copy; plate-sized edge components survive
+# 640px and CLAHE/Canny/labelling cost scales with the pixel count
+DETECTION_MAX_WIDTH = 640
+# A candidate is dropped as nested when a larger candidate covers at least this
+# fraction of its box; downscaled edges routinely overhang by a few pixels
+NESTED_COVERAGE = 0.8
+# Width the pixel thresholds in detect_text_regions were tuned for
+REFERENCE_WIDTH = 1280
+# Half-resolution decodes are only used when they still cover the 1280px working
+# width, so OCR crops keep the resolution they had with a full decode + resize
+REDUCED_DECODE_MIN_WIDTH = REFERENCE_WIDTH
+
+# Candidate text regions: one packed record per region
+REGION_DTYPE = np.dtype([
+    ('x', np.int32), ('y', np.int32), ('w', np.int32), ('h', np.int32),
+    ('area', np.int32), ('aspect_ratio', np.float64), ('size_ratio', np.float64)
+])
+
+# Per-region OCR runs concurrently; Tesseract releases the GIL while recognizing
+_OCR_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='alpr_ocr')
+
+@lru_cache(maxsize=1)
+def opencv_cpu_features() -> Dict:
+    """
+    SIMD features the bundled OpenCV was compiled with.
+    CLAHE, Canny and resize only take their NEON code paths on ARM when the
+    build has NEON in its baseline or dispatch list.
+    """
+    baseline, dispatched = [], []
+    for line in cv2.getBuildInformation().splitlines():
+        key, _, value = line.strip().partition(':')
+        if key == 'Baseline':
+            baseline = value.split()
+        elif key == 'Dispatched code generation':
+            dispatched = value.split()
+    return {
+        "baseline": baseline,
+        "dispatched": dispatched,
+        "neon": 'NEON' in baseline or 'NEON' in dispatched
+    }
+
+def is_arm_cpu() -> bool:
+    """True on ARM devices, where a NEON-less OpenCV build is a performance regression"""
+    return platform.machine().lower().startswith(('arm', 'aarch64'))
+
+def _confidence_core(size_ratio: float, aspect_ratio: float, text_length: int) -> float:
+    """Numeric part of the confidence score for a region whose text passed format validation"""
+    base_confidence = 40.0 + 40.0  # Base + valid format
+    
+    # Size factor (plates should be reasonable size)
+    if 0.002 < size_ratio < 0.05:  # More restrictive size range
+        base_confidence += 15.0
+    elif size_ratio < 0.001 or size_ratio > 0.1:
+        return 0.0  # Reject if too small or too large
+        
+    # Aspect ratio validation (license plates are rectangular)
+    if 2.0 < aspect_ratio < 6.0:  # Typical license plate ratios
+        base_confidence += 15.0
+    else:
+        base_confidence -= 20.0  # Penalize bad aspect ratios
+        
+    # Character count validation
+    if 5 <= text_length <= 8:  # Typical plate length
+        base_confidence += 10.0
+    else:
+        base_confidence -= 15.0
+        
+    return max(0.0, min(base_confidence, 95.0))
+
+if njit is not None:
+    # Explicit signature: compiled (or loaded from the cache) at import instead of
+    # on the first frame, with a single specialization for every caller.
+    # nogil lets scoring overlap with the threaded OCR workers
+    _confidence_core = njit('float64(float64, float64, int64)', cache=True, nogil=True)(_confidence_core)
+
 class ChaquopyPredatorALPR:
     """
     Predator-inspired ALPR engine optimized for Android Chaquopy
@@ -19,15 +163,31 @@ class ChaquopyPredatorALPR:
     def __init__(self):
         self.confidence_threshold = 85.0  # Even higher threshold to reduce false positives
         self.debug = True
-        self.valid_plate_patterns = [
-            r'^[A-Z]{2,3}[0-9]{3,4}$',  # ABC123, AB1234 (most common)
-            r'^[0-9][A-Z]{3}[0-9]{3}$',  # 1ABC123 format
-            r'^[A-Z][0-9]{2}[A-Z]{3}$',  # A12BCD format  
-            r'^[A-Z]{3}[0-9]{2}[A-Z]$',  # ABC12D format
-            r'^[0-9]{3}[A-Z]{3}$',  # 123ABC format
-        ]
-        # US state license plate character sets
-        self.valid_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789')
+        # Plate formats come from the module-level PLATE_PATTERNS / _PLATE_SHAPES table;
+        # these sets only back the letters-and-digits check in _validate_clean
+        self._digits = frozenset('0123456789')
+        self._letters = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+        # RealALPR OCR engine, created on first use and kept open across regions/frames
+        self._real_alpr = None
+        self._real_alpr_lock = threading.Lock()
+        # Set once the RealALPR import has failed; failed imports are not cached
+        # by Python, so retrying per region would search sys.path every time
+        self._real_ocr_unavailable = False
+        # CLAHE is built once and detection writes into reusable scratch buffers;
+        # both hold per-call state, so detection is serialized across callers
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+        self._buffers = {}
+        self._detect_lock = threading.Lock()
+        # OpenCL through OpenCV's transparent API (UMat) when a GPU device is
+        # present; without one UMat only adds wrapping overhead
+        self._use_opencl = cv2.ocl.haveOpenCL()
+        if self._use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        
+        # Warn when OpenCV was built without NEON: CLAHE/Canny/resize fall back to scalar code
+        if is_arm_cpu() and not opencv_cpu_features()["neon"]:
+            print("[ChaquopyALPR] WARNING: OpenCV build has no NEON support; "
+                  "image preprocessing will run without SIMD acceleration")
         
     def log(self, message: str) -> None:
         """Debug logging for Android logcat"""
@@ -36,148 +196,186 @@ class ChaquopyPredatorALPR:
             
     def validate_plate_format(self, plate_text: str) -> bool:
         """Validate license plate format using strict US rules"""
-        if not plate_text or len(plate_text) < 5:
-            return False
-            
-        # Remove spaces and convert to uppercase
-        plate_clean = re.sub(r'[^A-Z0-9]', '', plate_text.upper())
+        # Cheap raw-length reject first, then remove spaces and convert to uppercase
+        return (bool(plate_text) and len(plate_text) >= 5 and
+                self._validate_clean(canonical_plate_text(plate_text)))
         
+    def _validate_clean(self, plate_clean: str) -> bool:
+        """validate_plate_format for text that is already canonical (see canonical_plate_text)"""
         # Check length constraints (US standard)
-        if len(plate_clean) < 5 or len(plate_clean) > 8:
-            return False
-            
-        # Ensure all characters are valid
-        if not all(c in self.valid_chars for c in plate_clean):
+        if not 5 <= len(plate_clean) <= 8:
             return False
             
-        # Must have both letters and numbers
-        has_letters = any(c.isalpha() for c in plate_clean)
-        has_numbers = any(c.isdigit() for c in plate_clean)
-        if not (has_letters and has_numbers):
+        # Canonical text only holds valid characters; must have both letters and numbers
+        chars = set(plate_clean)
+        if chars.isdisjoint(self._letters) or chars.isdisjoint(self._digits):
             return False
             
-        # Check against specific patterns
-        for pattern in self.valid_plate_patterns:
-            if re.match(pattern, plate_clean):
-                self.log(f"Plate '{plate_clean}' matches pattern: {pattern}")
-                return True
-                
-        self.log(f"Plate '{plate_clean}' does not match any valid pattern")
-        return False
+        # Check against specific patterns: one table lookup on the text's shape
+        pattern_index = _PLATE_SHAPES.get(plate_clean.encode('ascii').translate(_SHAPE_TABLE))
         
-    def calculate_confidence(self, text: str, bbox_area: float, image_area: float, aspect_ratio: float) -> float:
-        """Calculate confidence score based on multiple factors"""
-        base_confidence = 40.0
+        # Only pay for the message formatting when it will be printed (rejects are the common case)
+        if self.debug:
+            if pattern_index is not None:
+                self.log(f"Plate '{plate_clean}' matches pattern: {PLATE_PATTERNS[pattern_index]}")
+            else:
+                self.log(f"Plate '{plate_clean}' does not match any valid pattern")
+        return pattern_index is not None
         
-        # Text quality factors - strict validation
-        if self.validate_plate_format(text):
-            base_confidence += 40.0  # Much higher weight for valid format
-        else:
+    def calculate_confidence(self, text: str, bbox_area: float, inv_image_area: float, aspect_ratio: float,
+                             canonical: bool = False) -> float:
+        """
+        Calculate confidence score based on multiple factors
+        inv_image_area is 1 / image area, computed once per frame by the caller
+        Pass canonical=True when text is already canonical to skip re-cleaning it
+        """
+        # Text quality factors - strict validation (regex stays in Python)
+        is_valid = self._validate_clean(text) if canonical else self.validate_plate_format(text)
+        if not is_valid:
             return 0.0  # Reject if format is invalid
             
-        # Size factor (plates should be reasonable size)
-        size_ratio = bbox_area / image_area
-        if 0.002 < size_ratio < 0.05:  # More restrictive size range
-            base_confidence += 15.0
-        elif size_ratio < 0.001 or size_ratio > 0.1:
-            return 0.0  # Reject if too small or too large
-            
-        # Aspect ratio validation (license plates are rectangular)
-        if 2.0 < aspect_ratio < 6.0:  # Typical license plate ratios
-            base_confidence += 15.0
-        else:
-            base_confidence -= 20.0  # Penalize bad aspect ratios
-            
-        # Character count validation
-        if 5 <= len(text) <= 8:  # Typical plate length
-            base_confidence += 10.0
-        else:
-            base_confidence -= 15.0
-            
-        return max(0.0, min(base_confidence, 95.0))
+        return float(_confidence_core(bbox_area * inv_image_area, float(aspect_ratio), len(text)))
+        
+    def _max_possible_confidence(self, bbox_area: float, inv_image_area: float, aspect_ratio: float) -> float:
+        """
+        Best score a region can reach whatever its OCR text, i.e. with a valid plate
+        (validation guarantees a 5-8 character length, so the length bonus is fixed)
+        """
+        return _confidence_core(bbox_area * inv_image_area, aspect_ratio, 5)
+        
+    def _scratch(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Reusable per-instance buffer, reallocated only when the frame shape changes"""
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype)
+            self._buffers[name] = buf
+        return buf
         
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
-        """Preprocess image for better ALPR detection"""
+        """
+        Preprocess image for better ALPR detection
+        Writes into scratch buffers: the result is only valid until the next call
+        """
+        shape = image.shape[:2]
+        
         # Convert to grayscale if needed
         if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._scratch('gray', shape))
         else:
             gray = image
         
         # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(gray)
+        enhanced = self._clahe.apply(gray, dst=self._scratch('enhanced', shape))
         
-        # Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(enhanced, (3, 3), 0)
+        # No extra blur: Canny's Sobel stage smooths enough, and a blur here
+        # would cost a full-image pass and soften the CLAHE contrast
+        return enhanced
         
-        return blurred
+    def detect_text_regions(self, image: np.ndarray, pixel_scale: float = 1.0) -> np.ndarray:
+        """
+        Detect potential text regions using OpenCV
+        Returns a REGION_DTYPE structured array, largest regions first
+        pixel_scale rescales the absolute pixel thresholds when detecting on a
+        smaller image than REFERENCE_WIDTH
+        """
+        shape = image.shape[:2]
         
-    def detect_text_regions(self, image: np.ndarray) -> List[Dict]:
-        """Detect potential text regions using OpenCV"""
-        processed = self.preprocess_image(image)
+        with self._detect_lock:
+            if self._use_opencl:
+                # Gray conversion, CLAHE and Canny run as OpenCL kernels with the
+                # intermediates kept on the device; only the edge map comes back
+                umat = cv2.UMat(image)
+                if len(shape) != image.ndim:
+                    umat = cv2.cvtColor(umat, cv2.COLOR_BGR2GRAY)
+                edges = cv2.Canny(self._clahe.apply(umat), 50, 150, L2gradient=True).get()
+            else:
+                processed = self.preprocess_image(image)
+                
+                # Edge detection (L2 gradient magnitude is better conditioned on unblurred input)
+                edges = cv2.Canny(processed, 50, 150, edges=self._scratch('edges', shape), L2gradient=True)
+            
+            # Bounding boxes of all connected edge components in a single C call
+            # stats rows are (x, y, w, h, pixel_area); row 0 is the background
+            _, _, stats, _ = cv2.connectedComponentsWithStats(
+                edges, labels=self._scratch('labels', shape, np.int32), connectivity=8, ltype=cv2.CV_32S)
+        stats = stats[1:]
         
-        # Edge detection
-        edges = cv2.Canny(processed, 50, 150)
+        inv_image_area = 1.0 / (image.shape[0] * image.shape[1])
+        w = stats[:, cv2.CC_STAT_WIDTH]
+        h = stats[:, cv2.CC_STAT_HEIGHT]
         
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Filter by aspect ratio (plates are wider than tall)
+        aspect_ratio = w / np.maximum(h, 1)
+        area = w * h
         
-        text_regions = []
-        image_area = image.shape[0] * image.shape[1]
+        # Much stricter filtering for license plates
+        size_ratio = area * inv_image_area
         
-        for contour in contours:
-            # Get bounding rectangle
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Filter by aspect ratio (plates are wider than tall)
-            aspect_ratio = w / h if h > 0 else 0
-            area = w * h
-            
-            # Much stricter filtering for license plates
-            size_ratio = area / image_area
-            
-            # License plates: aspect ratio 2-6, reasonable size, minimum area
-            if (2.0 < aspect_ratio < 6.0 and 
-                area > 2000 and  # Larger minimum area
-                0.002 < size_ratio < 0.05 and  # Reasonable size relative to image
-                w > 80 and h > 20):  # Minimum pixel dimensions
-                
-                text_regions.append({
-                    'bbox': (x, y, w, h),
-                    'area': area,
-                    'aspect_ratio': aspect_ratio,
-                    'size_ratio': size_ratio
-                })
-                
-        # Sort by area (larger regions first)
-        text_regions.sort(key=lambda r: r['area'], reverse=True)
+        # License plates: aspect ratio 2-6, reasonable size, minimum area
+        mask = ((aspect_ratio > 2.0) & (aspect_ratio < 6.0) &
+                (area > 2000 * pixel_scale * pixel_scale) &  # Larger minimum area
+                (size_ratio > 0.002) & (size_ratio < 0.05) &  # Reasonable size relative to image
+                (w > 80 * pixel_scale) & (h > 20 * pixel_scale))  # Minimum pixel dimensions
+        candidates = np.flatnonzero(mask)
+        
+        # Drop candidates nested inside a larger candidate (e.g. inner plate border),
+        # matching the outer-contour-only behaviour of RETR_EXTERNAL (see NESTED_COVERAGE)
+        x0 = stats[candidates, cv2.CC_STAT_LEFT]
+        y0 = stats[candidates, cv2.CC_STAT_TOP]
+        x1 = x0 + w[candidates]
+        y1 = y0 + h[candidates]
+        overlap_w = np.minimum(x1[None, :], x1[:, None]) - np.maximum(x0[None, :], x0[:, None])
+        overlap_h = np.minimum(y1[None, :], y1[:, None]) - np.maximum(y0[None, :], y0[:, None])
+        overlap = np.maximum(overlap_w, 0) * np.maximum(overlap_h, 0)
+        nested = ((overlap >= NESTED_COVERAGE * area[candidates][:, None]) &
+                  (area[candidates][None, :] > area[candidates][:, None]))
+        candidates = candidates[~nested.any(axis=1)]
+        
+        # Sort by area (larger regions first), top 3 candidates only
+        # (partial selection; ties keep detection order like a stable sort)
+        candidate_areas = area[candidates].tolist()
+        top = candidates[heapq.nlargest(3, range(len(candidate_areas)), key=candidate_areas.__getitem__)]
         
-        return text_regions[:3]  # Return top 3 candidates only
+        regions = np.empty(len(top), dtype=REGION_DTYPE)
+        regions['x'] = stats[top, cv2.CC_STAT_LEFT]
+        regions['y'] = stats[top, cv2.CC_STAT_TOP]
+        regions['w'] = w[top]
+        regions['h'] = h[top]
+        regions['area'] = area[top]
+        regions['aspect_ratio'] = aspect_ratio[top]
+        regions['size_ratio'] = size_ratio[top]
+        return regions
         
     def extract_text_real_ocr(self, image: np.ndarray, bbox: Tuple[int, int, int, int]) -> str:
         """
         Real OCR text extraction using Tesseract
         """
+        if self._real_ocr_unavailable:
+            return self.extract_text_fallback(image, bbox)
+            
         try:
-            from real_alpr import RealALPR
+            if self._real_alpr is None:
+                with self._real_alpr_lock:
+                    if self._real_alpr is None:
+                        from real_alpr import RealALPR
+                        self._real_alpr = RealALPR()
             
             x, y, w, h = bbox
             roi = image[y:y+h, x:x+w]
             
             # Use the real ALPR implementation for text extraction
-            real_alpr = RealALPR()
-            plate_text = real_alpr.extract_plate_text(roi)
+            plate_text = self._real_alpr.extract_plate_text(roi)
             
             if plate_text and len(plate_text) >= 4:
                 self.log(f"Real OCR extracted: '{plate_text}' from region {x},{y},{w},{h}")
-                return plate_text.upper()
+                return plate_text
             else:
                 self.log(f"Real OCR failed to extract text from region {x},{y},{w},{h}")
                 return ""
                 
         except ImportError:
             self.log("Real ALPR module not available, falling back to basic processing")
+            self._real_ocr_unavailable = True
             return self.extract_text_fallback(image, bbox)
         except Exception as e:
             self.log(f"Real OCR error: {str(e)}, falling back to basic processing")
@@ -197,71 +395,112 @@ class ChaquopyPredatorALPR:
     def process_image_from_path(self, image_path: str) -> Dict:
         """Process image file for license plate recognition"""
         try:
-            # Load image
-            image = cv2.imread(image_path)
+            # Load image: decoded like the byte entry points (grayscale, half
+            # resolution for large captures) instead of a full-color imread
+            try:
+                encoded = np.fromfile(image_path, dtype=np.uint8)
+            except OSError:
+                encoded = np.empty(0, np.uint8)
+            image, source_scale = _decode_image(encoded)
             if image is None:
                 return {"error": "Unable to load image", "success": False}
                 
-            return self.process_image_array(image)
+            return self.process_image_array(image, source_scale)
             
         except Exception as e:
             return {"error": str(e), "success": False}
             
-    def process_image_array(self, image: np.ndarray) -> Dict:
-        """Process numpy image array for license plate recognition"""
+    def process_image_array(self, image: np.ndarray, source_scale: float = 1.0) -> Dict:
+        """
+        Process numpy image array for license plate recognition
+        source_scale maps decoded pixels back to the source image (e.g. 2 after a
+        half-resolution decode) so reported coordinates stay in source pixels
+        """
         start_time = time.time()
         self.log(f"Processing image array with shape: {image.shape}")
         
         try:
             original_height, original_width = image.shape[:2]
             
-            # Resize for processing (optimize for mobile)
-            max_width = 1280
-            if original_width > max_width:
-                scale = max_width / original_width
+            # Convert to grayscale once per frame; detection and every OCR crop share it
+            if len(image.shape) == 3:
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            
+            # Downscale a detection copy (optimize for mobile); the original is
+            # kept for OCR crops and returned coordinates
+            scale = 1.0
+            detection_image = image
+            if original_width > DETECTION_MAX_WIDTH:
+                scale = DETECTION_MAX_WIDTH / original_width
                 new_width = int(original_width * scale)
                 new_height = int(original_height * scale)
-                image = cv2.resize(image, (new_width, new_height))
+                detection_image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
                 self.log(f"Resized to: {new_width}x{new_height}")
                 
-            # Detect potential plate regions
-            text_regions = self.detect_text_regions(image)
+            # Detect potential plate regions; thresholds are scaled against the
+            # source width, since a reduced decode is already smaller than the capture
+            pixel_scale = detection_image.shape[1] / min(original_width * source_scale, REFERENCE_WIDTH)
+            text_regions = self.detect_text_regions(detection_image, pixel_scale)
             self.log(f"Found {len(text_regions)} potential text regions")
             
             # Process each region
             detected_plates = []
-            image_area = image.shape[0] * image.shape[1]
+            inv_image_area = 1.0 / (detection_image.shape[0] * detection_image.shape[1])
+            
+            # Map the detection bboxes back onto the original image, skipping regions
+            # whose geometry alone keeps them below the threshold (no OCR for those)
+            region_shapes = []
+            bboxes = []
+            for dx, dy, dw, dh, region_area, aspect_ratio in text_regions[
+                    ['x', 'y', 'w', 'h', 'area', 'aspect_ratio']].tolist():
+                if self._max_possible_confidence(region_area, inv_image_area, aspect_ratio) < self.confidence_threshold:
+                    continue
+                x = int(dx / scale)
+                y = int(dy / scale)
+                w = min(int(round(dw / scale)), original_width - x)
+                h = min(int(round(dh / scale)), original_height - y)
+                region_shapes.append((region_area, aspect_ratio))
+                bboxes.append((x, y, w, h))
+            
+            # Extract text from all regions using real OCR, one region per worker
+            if len(bboxes) > 1:
+                plate_texts = list(_OCR_POOL.map(lambda bbox: self.extract_text_real_ocr(image, bbox), bboxes))
+            else:
+                plate_texts = [self.extract_text_real_ocr(image, bbox) for bbox in bboxes]
             
-            for i, region in enumerate(text_regions):
-                bbox = region['bbox']
+            for (region_area, aspect_ratio), bbox, plate_text in zip(region_shapes, bboxes, plate_texts):
                 x, y, w, h = bbox
                 
-                # Extract text from region using real OCR
-                plate_text = self.extract_text_real_ocr(image, bbox)
+                # Canonicalize once at the OCR boundary; everything below reuses it
+                plate_text = canonical_plate_text(plate_text)
+                if not plate_text:
+                    # OCR found nothing (or OCR is unavailable): nothing to score
+                    continue
                 
                 # Calculate confidence with aspect ratio
-                confidence = self.calculate_confidence(plate_text, region['area'], image_area, region['aspect_ratio'])
+                confidence = self.calculate_confidence(plate_text, region_area, inv_image_area, aspect_ratio,
+                                                       canonical=True)
                 
                 # Validate and filter - much stricter
                 if confidence >= self.confidence_threshold:
                     plate_data = {
-                        "plate_number": plate_text.upper(),
+                        "plate_number": plate_text,
                         "confidence": round(confidence, 1),
                         "region": "us",
                         "coordinates": {
-                            "x": int(x),
-                            "y": int(y), 
-                            "width": int(w),
-                            "height": int(h)
+                            "x": int(x * source_scale),
+                            "y": int(y * source_scale), 
+                            "width": int(w * source_scale),
+                            "height": int(h * source_scale)
                         },
-                        "aspect_ratio": round(region['aspect_ratio'], 2),
-                        "area": region['area']
+                        "aspect_ratio": round(aspect_ratio, 2),
+                        "area": int(w * h * source_scale * source_scale)
                     }
                     detected_plates.append(plate_data)
                     self.log(f"Valid plate detected: {plate_text} (confidence: {confidence}%)")
                     
             # Sort by confidence
-            detected_plates.sort(key=lambda p: p['confidence'], reverse=True)
+            detected_plates.sort(key=itemgetter('confidence'), reverse=True)
             
             processing_time = time.time() - start_time
             
@@ -271,7 +510,7 @@ class ChaquopyPredatorALPR:
                 "plates_detected": detected_plates,
                 "regions_analyzed": len(text_regions),
                 "image_info": {
-                    "original_size": f"{original_width}x{original_height}",
+                    "original_size": f"{int(original_width * source_scale)}x{int(original_height * source_scale)}",
                     "processed_at": int(time.time() * 1000),  # Timestamp in ms
                 },
                 "alpr_engine": "chaquopy_predator_cv2"
@@ -297,7 +536,56 @@ def process_image_file(image_path: str) -> str:
     Returns JSON string with results
     """
     results = alpr_processor.process_image_from_path(image_path)
-    return json.dumps(results)
+    return _dumps(results)
+
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...); C4/C8/CC
+# share the range but are table/extension markers without frame dimensions
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _jpeg_size(data: memoryview) -> Optional[Tuple[int, int]]:
+    """
+    (width, height) from a JPEG's start-of-frame header, as stored (before any
+    EXIF rotation), or None when the buffer is not a parsable JPEG.
+    Only the marker headers are walked; nothing is decoded.
+    """
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+    pos, end = 2, len(data)
+    while pos + 9 <= end:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # Fill byte before a marker
+            pos += 1
+        elif marker in _JPEG_SOF_MARKERS:
+            return (data[pos + 7] << 8 | data[pos + 8]), (data[pos + 5] << 8 | data[pos + 6])
+        elif marker == 0x01 or 0xD0 <= marker <= 0xD9:  # Standalone markers carry no length
+            pos += 2
+        else:
+            pos += 2 + (data[pos + 2] << 8 | data[pos + 3])
+    return None
+
+def _decode_image(nparr: np.ndarray) -> Tuple[Optional[np.ndarray], float]:
+    """
+    Decode encoded image bytes straight to grayscale, skipping the chroma planes
+    the pipeline would discard anyway. Large captures are decoded at half
+    resolution, letting libjpeg scale during IDCT. imdecode still applies the
+    EXIF orientation (and skips rotation for upright images).
+    Returns the image and the scale factor back to source pixels.
+    """
+    if not nparr.size:
+        return None, 1.0  # imdecode asserts on an empty buffer
+        
+    # Pick the decode from the header so every frame is decoded exactly once. EXIF
+    # rotation can make either stored edge the decoded width, so the half decode
+    # is only used when even the shorter edge stays at the working width
+    size = _jpeg_size(memoryview(nparr))
+    if size is not None and min(size) >= 2 * REDUCED_DECODE_MIN_WIDTH:
+        image = cv2.imdecode(nparr, cv2.IMREAD_REDUCED_GRAYSCALE_2)
+        if image is not None:
+            return image, 2.0
+        
+    return cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE), 1.0
 
 def process_image_bytes(image_bytes: bytes) -> str:
     """
@@ -307,23 +595,49 @@ def process_image_bytes(image_bytes: bytes) -> str:
     try:
         # Convert bytes to numpy array
         nparr = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        image, source_scale = _decode_image(nparr)
+        
+        if image is None:
+            return _dumps({"error": "Unable to decode image bytes", "success": False})
+            
+        results = alpr_processor.process_image_array(image, source_scale)
+        return _dumps(results)
+        
+    except Exception as e:
+        return _dumps({"error": str(e), "success": False})
+
+def process_image_direct(buf) -> str:
+    """
+    Process encoded image bytes from any buffer (e.g. a direct java.nio.ByteBuffer)
+    without copying them into a Python bytes object first.
+    Returns JSON string with results
+    """
+    try:
+        nparr = np.frombuffer(memoryview(buf), np.uint8)
+        image, source_scale = _decode_image(nparr)
         
         if image is None:
-            return json.dumps({"error": "Unable to decode image bytes", "success": False})
+            return _dumps({"error": "Unable to decode image buffer", "success": False})
             
-        results = alpr_processor.process_image_array(image)
-        return json.dumps(results)
+        results = alpr_processor.process_image_array(image, source_scale)
+        return _dumps(results)
         
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False})
+        return _dumps({"error": str(e), "success": False})
 
+@lru_cache(maxsize=1)
 def get_version_info() -> str:
-    """Get version and capability information"""
+    """
+    Get version and capability information
+    The payload is constant for the process, so it is serialized only once
+    """
     info = {
         "version": "1.0.0",
         "engine": "chaquopy_predator",
         "opencv_version": cv2.__version__,
+        # SIMD support of the bundled OpenCV, so a NEON-less build shows up in the app logs
+        "cpu_arch": platform.machine(),
+        "opencv_simd": opencv_cpu_features(),
         "capabilities": [
             "image_file_processing",
             "image_bytes_processing", 
@@ -335,12 +649,12 @@ def get_version_info() -> str:
         "max_image_size": "1280x960",
         "processing_time": "1-3 seconds typical"
     }
-    return json.dumps(info)
+    return _dumps(info)
 
 def set_confidence_threshold(threshold: float) -> str:
     """Set the confidence threshold for plate detection"""
     alpr_processor.confidence_threshold = max(0.0, min(100.0, threshold))
-    return json.dumps({
+    return _dumps({
         "success": True,
         "new_threshold": alpr_processor.confidence_threshold
     })
@@ -348,7 +662,7 @@ def set_confidence_threshold(threshold: float) -> str:
 def set_debug_mode(enabled: bool) -> str:
     """Enable or disable debug logging"""
     alpr_processor.debug = enabled
-    return json.dumps({
+    return _dumps({
         "success": True,
         "debug_enabled": alpr_processor.debug
     })
\ No newline at end of file
@@ -1,33 +1,116 @@
 import cv2
+import heapq
 import numpy as np
 import pytesseract
 import re
 from PIL import Image, ImageEnhance
 import logging
+import threading
+from operator import itemgetter
+
+# bytes.translate delete set shared with the Chaquopy engine, which imports this module lazily
+from predator_alpr import _STRIP_BYTES
+
+try:
+    # Optional: in-process Tesseract API that stays loaded between calls
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+except ImportError:
+    PyTessBaseAPI = None
+
+PLATE_CHAR_WHITELIST = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+# Initial size of the per-thread ROI preprocessing buffers (covers typical
+# plate crops); they grow if a larger region comes in
+ROI_SCRATCH_SHAPE = (128, 512)
+
+# Regexes are compiled once here instead of on every clean/validate call
+_STRIP_RE = re.compile(r'[^A-Z0-9]')
+
+# Common OCR corrections for license plates, applied only between digits
+_OCR_FIXES = {
+    'O': '0',  # Sometimes O is mistaken for 0
+    'I': '1',  # Sometimes I is mistaken for 1
+    'S': '5',  # Sometimes S is mistaken for 5
+    'B': '8',  # Sometimes B is mistaken for 8
+}
+# All corrections in one pass (a fix never creates a new digit-letter-digit
+# run, so this matches applying them one after another)
+_OCR_FIX_RE = re.compile('(?<=[0-9])[' + ''.join(_OCR_FIXES) + '](?=[0-9])')
+
+# Common patterns (can be extended)
+PLATE_PATTERNS = (
+    r'^[A-Z]{3}[0-9]{3,4}$',  # ABC123, ABC1234
+    r'^[0-9]{3}[A-Z]{3}$',    # 123ABC
+    r'^[A-Z]{2}[0-9]{2}[A-Z]{2}$', # AB12CD
+    r'^[A-Z]{1,2}[0-9]{2,4}[A-Z]{0,2}$', # Various formats
+)
+# All formats fused into one alternation so a candidate is scanned once
+_PLATE_RE = re.compile('^(?:' + '|'.join(p.strip('^$') for p in PLATE_PATTERNS) + ')$')
 
 class RealALPR:
     def __init__(self):
         # Configure Tesseract for better license plate recognition
-        self.tesseract_config = r'--oem 3 --psm 8 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+        self.tesseract_config = r'--oem 3 --psm 8 -c tessedit_char_whitelist=' + PLATE_CHAR_WHITELIST
+        # tesserocr API handles are not thread-safe: one per thread, opened on
+        # first OCR call in that thread and reused afterwards
+        self._tess_local = threading.local()
+        # Constant structuring element for preprocess_image, built once
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        # Per-thread scratch buffers for preprocess_image (regions are OCR'd concurrently)
+        self._scratch_local = threading.local()
+        
+    def _roi_buffers(self, height, width):
+        """This thread's pair of preprocessing buffers, sliced to height x width"""
+        buffers = getattr(self._scratch_local, 'buffers', None)
+        if buffers is None or buffers[0].shape[0] < height or buffers[0].shape[1] < width:
+            shape = (max(height, ROI_SCRATCH_SHAPE[0], buffers[0].shape[0] if buffers else 0),
+                     max(width, ROI_SCRATCH_SHAPE[1], buffers[0].shape[1] if buffers else 0))
+            buffers = (np.empty(shape, np.uint8), np.empty(shape, np.uint8))
+            self._scratch_local.buffers = buffers
+        return buffers[0][:height, :width], buffers[1][:height, :width]
+        
+    def run_tesseract(self, image):
+        """
+        OCR a preprocessed plate image.
+        Uses a persistent tesserocr API when available instead of spawning the
+        tesseract CLI (pytesseract) for every region.
+        """
+        if PyTessBaseAPI is None:
+            return pytesseract.image_to_string(image, config=self.tesseract_config)
+        
+        api = getattr(self._tess_local, 'api', None)
+        if api is None:
+            # Same settings as tesseract_config: default OEM, single-word page segmentation
+            api = PyTessBaseAPI(psm=PSM.SINGLE_WORD, oem=OEM.DEFAULT)
+            api.SetVariable('tessedit_char_whitelist', PLATE_CHAR_WHITELIST)
+            self._tess_local.api = api
+        
+        api.SetImage(Image.fromarray(image))
+        return api.GetUTF8Text()
         
     def preprocess_image(self, image):
-        """Enhanced preprocessing for license plate images"""
+        """
+        Enhanced preprocessing for license plate images
+        Stages ping-pong between per-thread scratch buffers: the result is only
+        valid until the next call on the same thread
+        """
+        buf_a, buf_b = self._roi_buffers(*image.shape[:2])
+        
         # Convert to grayscale
         if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=buf_b)
         else:
-            gray = image.copy()
+            gray = image  # Not modified in place below, no copy needed
             
         # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        blurred = cv2.GaussianBlur(gray, (5, 5), 0, dst=buf_a)
         
         # Apply morphological operations to clean up the image
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-        morph = cv2.morphologyEx(blurred, cv2.MORPH_CLOSE, kernel)
+        morph = cv2.morphologyEx(blurred, cv2.MORPH_CLOSE, self._morph_kernel, dst=buf_b)
         
         # Apply adaptive thresholding
         thresh = cv2.adaptiveThreshold(morph, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                       cv2.THRESH_BINARY, 11, 2)
+                                       cv2.THRESH_BINARY, 11, 2, dst=buf_a)
         
         return thresh
     
@@ -39,24 +122,29 @@ class RealALPR:
         # Find contours
         contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        # Filter contours based on license plate characteristics
-        plate_contours = []
-        for contour in contours:
-            # Calculate contour properties
-            area = cv2.contourArea(contour)
-            x, y, w, h = cv2.boundingRect(contour)
-            aspect_ratio = float(w) / h if h > 0 else 0
-            
-            # License plate aspect ratio is typically between 2:1 and 5:1
-            # and should have reasonable area
-            if (2.0 <= aspect_ratio <= 6.0 and 
-                area > 1000 and 
-                w > 50 and h > 15):
-                plate_contours.append((contour, x, y, w, h, area))
+        # Filter contours based on license plate characteristics, vectorized
+        # over all bounding boxes instead of a Python loop per contour
+        rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int32).reshape(-1, 4)
+        w = rects[:, 2]
+        h = rects[:, 3]
+        aspect_ratio = w / np.maximum(h, 1)
+        
+        # License plate aspect ratio is typically between 2:1 and 5:1
+        # and should have reasonable area (contour area never exceeds w*h)
+        candidates = np.flatnonzero((aspect_ratio >= 2.0) & (aspect_ratio <= 6.0) &
+                                    (w > 50) & (h > 15) & (w * h > 1000))
+        
+        # Exact contour area only for the boxes that survived
+        areas = np.array([cv2.contourArea(contours[i]) for i in candidates])
+        keep = areas > 1000
+        candidates = candidates[keep]
+        areas = areas[keep]
         
         # Sort by area (largest first) and return top candidates
-        plate_contours.sort(key=lambda x: x[5], reverse=True)
-        return plate_contours[:3]  # Top 3 candidates
+        # (partial selection; ties keep contour order like a stable sort)
+        order = heapq.nlargest(3, range(len(areas)), key=areas.__getitem__)  # Top 3 candidates
+        return [(contours[candidates[j]], *map(int, rects[candidates[j]]), float(areas[j]))
+                for j in order]
     
     def extract_plate_text(self, image_region):
         """Extract text from a license plate region using OCR"""
@@ -86,7 +174,7 @@ class RealALPR:
                 processed = cv2.resize(processed, (new_width, 32), interpolation=cv2.INTER_CUBIC)
             
             # Perform OCR
-            text = pytesseract.image_to_string(processed, config=self.tesseract_config)
+            text = self.run_tesseract(processed)
             
             # Clean and validate the text
             cleaned_text = self.clean_plate_text(text)
@@ -105,21 +193,15 @@ class RealALPR:
         text = text.strip().upper()
         
         # Remove non-alphanumeric characters
-        text = re.sub(r'[^A-Z0-9]', '', text)
-        
-        # Common OCR corrections for license plates
-        corrections = {
-            'O': '0',  # Sometimes O is mistaken for 0
-            'I': '1',  # Sometimes I is mistaken for 1
-            'S': '5',  # Sometimes S is mistaken for 5
-            'B': '8',  # Sometimes B is mistaken for 8
-        }
+        # OCR output is ASCII, so a bytes translate can replace the regex engine
+        if text.isascii():
+            text = text.encode('ascii').translate(None, _STRIP_BYTES).decode('ascii')
+        else:
+            text = _STRIP_RE.sub('', text)
         
         # Apply corrections only if it makes sense in context
-        corrected_text = text
-        for old, new in corrections.items():
-            # Only apply if the character is surrounded by numbers
-            corrected_text = re.sub(f'(?<=[0-9]){old}(?=[0-9])', new, corrected_text)
+        # Only apply if the character is surrounded by numbers
+        corrected_text = _OCR_FIX_RE.sub(lambda m: _OCR_FIXES[m.group()], text)
         
         # Validate plate format (basic validation)
         if len(corrected_text) >= 4 and len(corrected_text) <= 8:
@@ -135,21 +217,33 @@ class RealALPR:
             if image is None:
                 return []
                 
+            return self.process_image_array(image)
+            
+        except Exception as e:
+            logging.error(f"Error processing image: {str(e)}")
+            return []
+    
+    def process_image_array(self, image):
+        """
+        Process an already-decoded BGR (or grayscale) image and extract license plates
+        """
+        try:
+            # Convert to grayscale for processing, before resizing so the
+            # resize only has one channel to filter
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+            
             # Resize image for processing (maintain aspect ratio)
-            height, width = image.shape[:2]
+            height, width = gray.shape
             if width > 1280:
                 scale = 1280 / width
                 new_height = int(height * scale)
-                image = cv2.resize(image, (1280, new_height), interpolation=cv2.INTER_AREA)
-            
-            # Convert to grayscale for processing
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                gray = cv2.resize(gray, (1280, new_height), interpolation=cv2.INTER_AREA)
             
             # Find potential license plate regions
             plate_contours = self.find_license_plate_contours(gray)
             
             results = []
-            for i, (contour, x, y, w, h, area) in enumerate(plate_contours):
+            for contour, x, y, w, h, area in plate_contours:
                 # Extract the region of interest
                 roi = gray[y:y+h, x:x+w]
                 
@@ -173,7 +267,7 @@ class RealALPR:
                     })
             
             # Sort by confidence
-            results.sort(key=lambda x: x['confidence'], reverse=True)
+            results.sort(key=itemgetter('confidence'), reverse=True)
             return results
             
         except Exception as e:
@@ -210,19 +304,7 @@ class RealALPR:
         if not text or len(text) < 4:
             return False
             
-        # Common patterns (can be extended)
-        patterns = [
-            r'^[A-Z]{3}[0-9]{3,4}$',  # ABC123, ABC1234
-            r'^[0-9]{3}[A-Z]{3}$',    # 123ABC
-            r'^[A-Z]{2}[0-9]{2}[A-Z]{2}$', # AB12CD
-            r'^[A-Z]{1,2}[0-9]{2,4}[A-Z]{0,2}$', # Various formats
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, text):
-                return True
-        
-        return False
+        return _PLATE_RE.match(text) is not None
 
 def recognize_license_plates(image_path):
     """Main function called from Flutter"""
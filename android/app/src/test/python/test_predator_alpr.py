@@ -0,0 +1,82 @@
+"""
+Regression checks for the Chaquopy ALPR module (android/app/src/main/python)
+Run with: python -m unittest discover android/app/src/test/python
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'main', 'python'))
+
+import predator_alpr
+
+
+def synthetic_frame(width, height, plate_width):
+    """Dark frame with one bordered white plate-shaped box (3:1) near the centre"""
+    image = np.full((height, width, 3), 60, np.uint8)
+    x, y = width // 2, height // 2
+    corner = (x + plate_width, y + plate_width // 3)
+    cv2.rectangle(image, (x, y), corner, (255, 255, 255), -1)
+    cv2.rectangle(image, (x, y), corner, (0, 0, 0), 2)
+    return image
+
+
+class FileEntryPointTest(unittest.TestCase):
+    def setUp(self):
+        self.alpr = predator_alpr.ChaquopyPredatorALPR()
+        self.alpr.debug = False
+        # No Tesseract needed: every region OCRs to a valid plate
+        patcher = mock.patch.object(self.alpr, 'extract_text_real_ocr', return_value='ABC1234')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def process_file(self, image):
+        fd, path = tempfile.mkstemp(suffix='.jpg')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        cv2.imwrite(path, image)
+        return self.alpr.process_image_from_path(path)
+
+    def test_1080p_capture_finds_small_plates(self):
+        # Pixel thresholds must be scaled against the source width, not the decoded width
+        for plate_width in (130, 145, 160):
+            with self.subTest(plate_width=plate_width):
+                result = self.process_file(synthetic_frame(1920, 1080, plate_width))
+                self.assertTrue(result["success"])
+                self.assertEqual(len(result["plates_detected"]), 1)
+                self.assertEqual(result["image_info"]["original_size"], "1920x1080")
+
+    def test_file_and_array_entry_points_agree(self):
+        image = synthetic_frame(1920, 1080, 145)
+        from_file = self.process_file(image)
+        from_array = self.alpr.process_image_array(image)
+        self.assertEqual(len(from_file["plates_detected"]), len(from_array["plates_detected"]))
+
+
+
+class DecodeTest(unittest.TestCase):
+    def decode(self, width, height):
+        encoded = np.frombuffer(cv2.imencode('.jpg', synthetic_frame(width, height, 145))[1].tobytes(), np.uint8)
+        with mock.patch.object(predator_alpr.cv2, 'imdecode', wraps=cv2.imdecode) as imdecode:
+            image, source_scale = predator_alpr._decode_image(encoded)
+        # The decode flag is chosen from the JPEG header, never by decoding twice
+        self.assertEqual(imdecode.call_count, 1)
+        return image, source_scale
+
+    def test_camera_frame_decodes_at_full_resolution(self):
+        image, source_scale = self.decode(1280, 720)
+        self.assertEqual((image.shape, source_scale), ((720, 1280), 1.0))
+
+    def test_large_capture_decodes_at_half_resolution(self):
+        image, source_scale = self.decode(4000, 3000)
+        self.assertEqual((image.shape, source_scale), ((1500, 2000), 2.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
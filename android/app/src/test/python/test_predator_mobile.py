@@ -0,0 +1,80 @@
+"""
+Regression checks for the Termux ALPR detector (termux_scripts/predator_mobile.py)
+Run with: python -m unittest discover android/app/src/test/python
+"""
+
+import os
+import sys
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', '..', 'termux_scripts'))
+
+import predator_mobile
+
+
+def car_scene(seed, noise):
+    """1280x720 frame: a plate on a car body, surrounded by outlined clutter boxes"""
+    rng = np.random.default_rng(seed)
+    width, height = 1280, 720
+    image = np.full((height, width, 3), rng.integers(90, 140), np.uint8)
+    for _ in range(12):
+        x, y = int(rng.integers(0, width - 100)), int(rng.integers(0, height - 60))
+        corner = (x + int(rng.integers(20, 200)), y + int(rng.integers(10, 120)))
+        cv2.rectangle(image, (x, y), corner, tuple(int(v) for v in rng.integers(0, 255, 3)), 2)
+
+    car_x, car_y = int(rng.integers(150, width - 550)), int(rng.integers(100, height - 350))
+    car_w, car_h = int(rng.integers(380, 520)), int(rng.integers(220, 300))
+    cv2.rectangle(image, (car_x, car_y), (car_x + car_w, car_y + car_h),
+                  tuple(int(v) for v in rng.integers(20, 200, 3)), -1)
+
+    plate_w = int(rng.integers(120, 220))
+    plate_h = plate_w * 10 // 45
+    plate_x = car_x + (car_w - plate_w) // 2
+    plate_y = car_y + car_h - plate_h - int(rng.integers(15, 40))
+    cv2.rectangle(image, (plate_x, plate_y), (plate_x + plate_w, plate_y + plate_h), (235, 235, 235), -1)
+    cv2.rectangle(image, (plate_x, plate_y), (plate_x + plate_w, plate_y + plate_h), (30, 30, 30), 2)
+    cv2.putText(image, 'ABC123', (plate_x + 8, plate_y + plate_h - 8),
+                cv2.FONT_HERSHEY_SIMPLEX, plate_w / 200, (0, 0, 0), 2)
+
+    if noise:
+        image = np.clip(image.astype(np.int16) + rng.normal(0, 12, image.shape), 0, 255).astype(np.uint8)
+    return image, (plate_x, plate_y, plate_w + 1, plate_h + 1)
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    inter = (max(0, min(ax + aw, bx + bw) - max(ax, bx)) *
+             max(0, min(ay + ah, by + bh) - max(ay, by)))
+    return inter / (aw * ah + bw * bh - inter)
+
+
+class DetectorRecallTest(unittest.TestCase):
+    SCENES = 60
+
+    def setUp(self):
+        self.alpr = predator_mobile.MobilePredatorALPR()
+        self.alpr.debug = False
+
+    def recall(self, noise):
+        hits = 0
+        for seed in range(self.SCENES):
+            image, plate = car_scene(seed, noise)
+            regions = self.alpr.detect_text_regions(image)[['x', 'y', 'w', 'h']].tolist()
+            hits += any(iou(region, plate) > 0.5 for region in regions)
+        return hits
+
+    def test_plate_recall_with_sensor_noise(self):
+        # The blurred default-gradient detector found 30/60; merged contours drop this to ~1
+        self.assertGreaterEqual(self.recall(noise=True), 27)
+
+    def test_plate_recall_clean(self):
+        # Blurred default-gradient detector: 37/60
+        self.assertGreaterEqual(self.recall(noise=False), 35)
+
+
+if __name__ == '__main__':
+    unittest.main()
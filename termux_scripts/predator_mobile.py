@@ -7,54 +7,112 @@ Adapted for Samsung Galaxy S25 local processing
 
 import cv2
 import json
+import numpy as np
 import sys
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
 
+# Demo OCR output until a real recognizer is wired in (see extract_text_pytesseract)
+MOCK_PLATES = ("ABC123", "XYZ789", "DEF456", "GHI012", "JKL345")
+
+# Accepted plate formats
+PLATE_PATTERNS = (
+    r'^[A-Z0-9]{2,8}$',  # Basic alphanumeric
+    r'^[A-Z]{1,3}[0-9]{1,4}[A-Z]?$',  # Standard US format
+    r'^[0-9]{1,3}[A-Z]{1,3}[0-9]{1,4}$',  # Mixed format
+)
+
+# Compiled once instead of going through re's pattern cache on every call;
+# the plate formats are fused into one alternation so a string is matched once
+_CLEAN_RE = re.compile(r'[^A-Z0-9]')
+_PLATE_RE = re.compile('^(?:' + '|'.join(p.strip('^$') for p in PLATE_PATTERNS) + ')$')
+
+# One record per candidate plate region returned by detect_text_regions
+REGION_DTYPE = np.dtype([
+    ('x', np.int32), ('y', np.int32), ('w', np.int32), ('h', np.int32),
+    ('area', np.int32), ('aspect_ratio', np.float64)
+])
+
 class MobilePredatorALPR:
-    def __init__(self):
+    def __init__(self, working_size=(1280, 960), parallel=True):
         self.confidence_threshold = 60.0
         self.debug = True
-        self.valid_plate_patterns = [
-            r'^[A-Z0-9]{2,8}$',  # Basic alphanumeric
-            r'^[A-Z]{1,3}[0-9]{1,4}[A-Z]?$',  # Standard US format
-            r'^[0-9]{1,3}[A-Z]{1,3}[0-9]{1,4}$',  # Mixed format
-        ]
-        
-    def log(self, message):
-        """Debug logging"""
+        # Debug lines go to stdout when None; batch mode moves them to stderr
+        self.log_file = None
+        # Region OCR runs on a small thread pool (native OCR releases the GIL);
+        # the pool is only started once a frame has more than one region
+        self.parallel = parallel
+        self._ocr_pool = None
+        # CLAHE allocates its tile/LUT state on construction: build it once per instance
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+        # Frames are shrunk to fit working_size (width, height). Camera output is
+        # stable within a session, so the per-frame intermediates are allocated
+        # up front for that size
+        self.working_size = working_size
+        buf_shape = (working_size[1], working_size[0])
+        self._gray_buf = np.empty(buf_shape, dtype=np.uint8)
+        self._enhanced_buf = np.empty(buf_shape, dtype=np.uint8)
+        self._edge_buf = np.empty(buf_shape, dtype=np.uint8)
+        
+    def _frame_buffer(self, name, shape):
+        """Return the named uint8 scratch buffer, reallocating only if the frame size changed"""
+        buf = getattr(self, name)
+        if buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            setattr(self, name, buf)
+        return buf
+        
+    def ocr_regions(self, gray, bboxes):
+        """Run extract_text_pytesseract for every bbox, concurrently when worthwhile"""
+        if not self.parallel or len(bboxes) < 2:
+            return [self.extract_text_pytesseract(gray, bbox) for bbox in bboxes]
+        if self._ocr_pool is None:
+            self._ocr_pool = ThreadPoolExecutor(max_workers=4)
+        return list(self._ocr_pool.map(partial(self.extract_text_pytesseract, gray), bboxes))
+        
+    def log(self, message, *args):
+        """Debug logging (printf-style args are only formatted when debug is on)"""
         if self.debug:
+            if args:
+                message = message % args
             timestamp = datetime.now().strftime("%H:%M:%S")
-            print(f"[{timestamp}] ALPR: {message}")
+            print(f"[{timestamp}] ALPR: {message}", file=self.log_file)
             
     def validate_plate_format(self, plate_text):
         """Validate license plate format using Predator-inspired rules"""
-        if not plate_text or len(plate_text) < 2:
+        # Anything this long is an OCR paragraph, not a plate: reject before regex work
+        if not plate_text or len(plate_text) < 2 or len(plate_text) > 32:
             return False
             
-        # Remove spaces and convert to uppercase
-        plate_clean = re.sub(r'[^A-Z0-9]', '', plate_text.upper())
+        # Remove spaces and convert to uppercase (already-clean ASCII text skips the regex)
+        plate_clean = plate_text.upper()
+        if not (plate_clean.isascii() and plate_clean.isalnum()):
+            plate_clean = _CLEAN_RE.sub('', plate_clean)
         
         # Check length constraints
         if len(plate_clean) < 4 or len(plate_clean) > 8:
             return False
             
         # Check against common patterns
-        for pattern in self.valid_plate_patterns:
-            if re.match(pattern, plate_clean):
-                return True
-                
-        return False
+        return _PLATE_RE.match(plate_clean) is not None
         
-    def calculate_confidence(self, text, bbox_area, image_area):
-        """Calculate confidence score based on multiple factors"""
+    def calculate_confidence(self, text, bbox_area, image_area, is_valid=None):
+        """
+        Calculate confidence score based on multiple factors
+        Pass is_valid when the caller already ran validate_plate_format on text
+        """
         base_confidence = 50.0
         
         # Text quality factors
-        if self.validate_plate_format(text):
+        if is_valid is None:
+            is_valid = self.validate_plate_format(text)
+        if is_valid:
             base_confidence += 25.0
             
         # Size factor (plates should be reasonable size)
@@ -71,56 +129,71 @@ class MobilePredatorALPR:
     def preprocess_image(self, image):
         """Preprocess image for better ALPR detection"""
         # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        shape = image.shape[:2]
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._frame_buffer('_gray_buf', shape))
         
         # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(gray)
+        enhanced = self._clahe.apply(gray, dst=self._frame_buffer('_enhanced_buf', shape))
         
-        # Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(enhanced, (3, 3), 0)
+        # Gaussian blur to reduce noise (in place: the CLAHE buffer is not needed
+        # unblurred). Without it edges of neighbouring objects merge into one outer
+        # contour, hiding every box inside it from RETR_EXTERNAL
+        return cv2.GaussianBlur(enhanced, (3, 3), 0, dst=enhanced)
         
-        return blurred
+    def detect_text_regions(self, image, processed=None):
+        """
+        Detect potential text regions using OpenCV
+        Returns a REGION_DTYPE structured array, largest regions first
+        """
+        # Callers that also need the grayscale frame pass it in to avoid a second pass
+        if processed is None:
+            processed = self.preprocess_image(image)
         
-    def detect_text_regions(self, image):
-        """Detect potential text regions using OpenCV"""
-        processed = self.preprocess_image(image)
-        
-        # Edge detection
-        edges = cv2.Canny(processed, 50, 150)
+        # Edge detection (L2 gradient magnitude keeps plate borders from fusing with clutter)
+        edges = cv2.Canny(processed, 50, 150, L2gradient=True, edges=self._frame_buffer('_edge_buf', processed.shape))
         
         # Find contours
         contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        text_regions = []
-        image_area = image.shape[0] * image.shape[1]
-        
-        for contour in contours:
-            # Get bounding rectangle
-            x, y, w, h = cv2.boundingRect(contour)
+        if not contours:
+            return np.empty(0, dtype=REGION_DTYPE)
             
-            # Filter by aspect ratio (plates are wider than tall)
-            aspect_ratio = w / h if h > 0 else 0
-            area = w * h
-            
-            # Typical license plate aspect ratios: 2:1 to 6:1
-            if 1.5 < aspect_ratio < 8.0 and area > 1000:
-                text_regions.append({
-                    'bbox': (x, y, w, h),
-                    'area': area,
-                    'aspect_ratio': aspect_ratio
-                })
-                
-        # Sort by area (larger regions first)
-        text_regions.sort(key=lambda r: r['area'], reverse=True)
+        # Bounding rects for all contours at once: min/max over each contour's
+        # slice of the concatenated points gives exactly what boundingRect
+        # returns, without a Python-level call per (mostly tiny) contour
+        lengths = np.fromiter(map(len, contours), dtype=np.intp, count=len(contours))
+        starts = np.zeros_like(lengths)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        points = np.concatenate(contours).reshape(-1, 2)
+        mins = np.minimum.reduceat(points, starts)
+        sizes = np.maximum.reduceat(points, starts) - mins + 1
+        rects = np.column_stack((mins, sizes)).astype(np.int32, copy=False)
+        widths, heights = rects[:, 2], rects[:, 3]
+        areas = widths * heights
+        aspect_ratios = widths / np.maximum(heights, 1)
         
-        return text_regions[:5]  # Return top 5 candidates
+        # Typical license plate aspect ratios: 2:1 to 6:1
+        mask = (aspect_ratios > 1.5) & (aspect_ratios < 8.0) & (areas > 1000)
+        rects, areas, aspect_ratios = rects[mask], areas[mask], aspect_ratios[mask]
+        
+        # Sort by area (larger regions first), stable so ties keep contour order
+        order = np.argsort(-areas, kind='stable')[:5]
+        
+        text_regions = np.empty(len(order), dtype=REGION_DTYPE)
+        for field, column in zip(('x', 'y', 'w', 'h'), rects[order].T):
+            text_regions[field] = column
+        text_regions['area'] = areas[order]
+        text_regions['aspect_ratio'] = aspect_ratios[order]
+        
+        return text_regions  # Top 5 candidates
         
     def extract_text_pytesseract(self, image, bbox):
         """Extract text using basic character recognition"""
         # This is a simplified version - in full implementation,
         # you would use pytesseract or another OCR engine
         
+        # image is the preprocessed grayscale frame, so the ROI needs no
+        # per-region color conversion before OCR
         x, y, w, h = bbox
         roi = image[y:y+h, x:x+w]
         
@@ -129,15 +202,19 @@ class MobilePredatorALPR:
         # import pytesseract
         # text = pytesseract.image_to_string(roi, config='--psm 8 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789')
         
-        mock_plates = ["ABC123", "XYZ789", "DEF456", "GHI012", "JKL345"]
-        return mock_plates[hash(str(bbox)) % len(mock_plates)]
+        # Plain integer mix of the box origin: deterministic across runs
+        # (str hashing is salted per process) and no string allocation per region
+        return MOCK_PLATES[(x * 31 + y) % len(MOCK_PLATES)]
         
     def process_image(self, image_path):
         """Main processing function - Predator-inspired workflow"""
         start_time = time.time()
-        self.log(f"Processing image: {image_path}")
+        self.log("Processing image: %s", image_path)
         
-        if not os.path.exists(image_path):
+        # One stat serves both the existence check and the reported file size
+        try:
+            file_size = os.stat(image_path).st_size
+        except OSError:
             return {"error": "Image file not found", "success": False}
             
         try:
@@ -147,55 +224,62 @@ class MobilePredatorALPR:
                 return {"error": "Unable to load image", "success": False}
                 
             original_height, original_width = image.shape[:2]
-            self.log(f"Image dimensions: {original_width}x{original_height}")
-            
-            # Resize for processing (optimize for mobile)
-            max_width = 1280
-            if original_width > max_width:
-                scale = max_width / original_width
-                new_width = int(original_width * scale)
-                new_height = int(original_height * scale)
-                image = cv2.resize(image, (new_width, new_height))
-                self.log(f"Resized to: {new_width}x{new_height}")
+            self.log("Image dimensions: %dx%d", original_width, original_height)
+            
+            # Resize for processing (optimize for mobile): fit within the working
+            # size on both edges so portrait captures shrink too, before any
+            # grayscale/CLAHE/Canny work touches the pixels
+            max_width, max_height = self.working_size
+            scale = min(1.0, max_width / original_width, max_height / original_height)
+            width, height = original_width, original_height
+            if scale < 1.0:
+                width = int(original_width * scale)
+                height = int(original_height * scale)
+                image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+                self.log("Resized to: %dx%d", width, height)
+            image_area = width * height
                 
-            # Detect potential plate regions
-            text_regions = self.detect_text_regions(image)
-            self.log(f"Found {len(text_regions)} potential text regions")
+            # Detect potential plate regions; the grayscale frame is kept for OCR
+            gray = self.preprocess_image(image)
+            text_regions = self.detect_text_regions(image, gray)
+            self.log("Found %d potential text regions", len(text_regions))
             
-            # Process each region
-            detected_plates = []
-            image_area = image.shape[0] * image.shape[1]
+            # Process each region; accepted plates are kept as flat tuples and
+            # only turned into result dicts once they have been ranked
+            candidates = []
             
-            for i, region in enumerate(text_regions):
-                bbox = region['bbox']
-                x, y, w, h = bbox
-                
-                # Extract text from region
-                plate_text = self.extract_text_pytesseract(image, bbox)
+            # Extract text from all regions (independent, so they can run in parallel)
+            regions = text_regions.tolist()
+            plate_texts = self.ocr_regions(gray, [region[:4] for region in regions])
+            
+            for (x, y, w, h, area, aspect_ratio), plate_text in zip(regions, plate_texts):
+                # Validate once; the result feeds both the confidence and the filter
+                is_valid = self.validate_plate_format(plate_text)
                 
                 # Calculate confidence
-                confidence = self.calculate_confidence(plate_text, region['area'], image_area)
+                confidence = self.calculate_confidence(plate_text, area, image_area, is_valid)
                 
                 # Validate and filter
-                if confidence >= self.confidence_threshold and self.validate_plate_format(plate_text):
-                    plate_data = {
-                        "plate_number": plate_text.upper(),
-                        "confidence": round(confidence, 1),
-                        "region": "us",
-                        "coordinates": {
-                            "x": int(x),
-                            "y": int(y), 
-                            "width": int(w),
-                            "height": int(h)
-                        },
-                        "aspect_ratio": round(region['aspect_ratio'], 2),
-                        "area": region['area']
-                    }
-                    detected_plates.append(plate_data)
-                    self.log(f"Valid plate detected: {plate_text} (confidence: {confidence}%)")
+                if confidence >= self.confidence_threshold and is_valid:
+                    candidates.append((round(confidence, 1), plate_text, (x, y, w, h), area, aspect_ratio))
+                    self.log("Valid plate detected: %s (confidence: %s%%)", plate_text, confidence)
                     
             # Sort by confidence
-            detected_plates.sort(key=lambda p: p['confidence'], reverse=True)
+            candidates.sort(key=itemgetter(0), reverse=True)
+            
+            detected_plates = [{
+                "plate_number": plate_text.upper(),
+                "confidence": confidence,
+                "region": "us",
+                "coordinates": {
+                    "x": int(x),
+                    "y": int(y), 
+                    "width": int(w),
+                    "height": int(h)
+                },
+                "aspect_ratio": round(aspect_ratio, 2),
+                "area": area
+            } for confidence, plate_text, (x, y, w, h), area, aspect_ratio in candidates]
             
             processing_time = time.time() - start_time
             
@@ -208,41 +292,84 @@ class MobilePredatorALPR:
                     "path": image_path,
                     "original_size": f"{original_width}x{original_height}",
                     "processed_at": datetime.now().isoformat(),
-                    "file_size": os.path.getsize(image_path) if os.path.exists(image_path) else 0
+                    "file_size": file_size
                 },
                 "alpr_engine": "predator_mobile_cv2"
             }
             
-            self.log(f"Processing completed in {processing_time:.2f}s")
+            self.log("Processing completed in %.2fs", processing_time)
             return results
             
         except Exception as e:
-            self.log(f"Error processing image: {str(e)}")
+            self.log("Error processing image: %s", e)
             return {
                 "error": str(e),
                 "success": False,
                 "processing_time": time.time() - start_time
             }
 
+# File types picked up when a directory is passed to main()
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+def batch_image_paths(target):
+    """Expand '@list.txt' (one path per line) or a directory into image paths, else None"""
+    if target.startswith('@'):
+        with open(target[1:]) as list_file:
+            return [line.strip() for line in list_file if line.strip()]
+    if os.path.isdir(target):
+        return sorted(
+            os.path.join(target, name) for name in os.listdir(target)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+    return None
+
+# Compact output for the Flutter side, which only parses it; --pretty restores indentation
+JSON_SEPARATORS = (',', ':')
+
 def main():
     """Command line interface"""
-    if len(sys.argv) != 2:
+    args = sys.argv[1:]
+    pretty = '--pretty' in args
+    if pretty:
+        args.remove('--pretty')
+    if len(args) != 1:
         print(json.dumps({
-            "error": "Usage: python predator_mobile.py <image_path>",
+            "error": "Usage: python predator_mobile.py [--pretty] <image_path | image_dir | @file_list.txt>",
             "success": False
-        }))
+        }, separators=JSON_SEPARATORS))
         sys.exit(1)
         
-    image_path = sys.argv[1]
+    target = args[0]
     
-    # Create ALPR processor
+    # Create ALPR processor (shared by every image in batch mode, so CLAHE,
+    # compiled regexes and frame buffers are built once)
     alpr = MobilePredatorALPR()
     
-    # Process image
-    results = alpr.process_image(image_path)
-    
-    # Output JSON results for Flutter consumption
-    print(json.dumps(results, indent=2))
+    try:
+        batch_paths = batch_image_paths(target)
+    except OSError as e:
+        print(json.dumps({
+            "error": f"Unable to read image list: {e}",
+            "success": False
+        }, separators=JSON_SEPARATORS))
+        sys.exit(1)
+        
+    if batch_paths is None:
+        # Process image
+        results = alpr.process_image(target)
+        
+        # Output JSON results for Flutter consumption
+        if pretty:
+            print(json.dumps(results, indent=2))
+        else:
+            print(json.dumps(results, separators=JSON_SEPARATORS))
+        return
+        
+    # Batch mode: stream one JSON result per line as each image finishes, with
+    # debug logging on stderr so stdout stays parseable line by line
+    alpr.log_file = sys.stderr
+    for image_path in batch_paths:
+        print(json.dumps(alpr.process_image(image_path), separators=JSON_SEPARATORS), flush=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file